@@ -1,34 +1,100 @@
-from fastapi import FastAPI, HTTPException
+import os
+
+# One native thread per worker process: parallelism comes from uvicorn workers, and
+# these must be set before numpy/xgboost load their OpenMP/BLAS runtimes
+for _var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS", "NUMEXPR_NUM_THREADS"):
+    os.environ.setdefault(_var, "1")
+
+from fastapi import FastAPI, HTTPException, Body
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, Response
+import orjson
 import uvicorn
 import logging
+from logging.handlers import QueueHandler, QueueListener
+import queue
 from datetime import datetime
-import os
+from functools import lru_cache
+from typing import List
+import sys
 
 from src.predict import predictor
 from src.schemas import PredictionInput, PredictionResponse, HealthResponse, ModelMetadata
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Configure logging: request handlers only enqueue records; a listener thread
+# does the blocking writes to stderr
+_log_queue = queue.Queue(-1)
+_log_listener = QueueListener(_log_queue, logging.StreamHandler())
+logging.basicConfig(level=logging.INFO, handlers=[QueueHandler(_log_queue)])
 logger = logging.getLogger(__name__)
 
 app = FastAPI(
     title="Concrete Strength Prediction API",
     description="API for predicting concrete compressive strength based on composition and age",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
+# Upper bound on mixes per /predict/batch request
+MAX_BATCH_SIZE = 256
+
 # CORS middleware - UPDATED FOR PRODUCTION
-# Get allowed origins from environment variable or use wildcard for development
-ALLOWED_ORIGINS = os.getenv("ALLOWED_ORIGINS", "*").split(",")
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=ALLOWED_ORIGINS,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# Explicit origins from ALLOWED_ORIGINS; wildcard only for local development.
+# On Render without ALLOWED_ORIGINS the middleware is skipped entirely: the
+# Streamlit frontend calls the API server-side, so no browser origin needs it.
+ALLOWED_ORIGINS = os.getenv("ALLOWED_ORIGINS")
+
+if ALLOWED_ORIGINS:
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=[origin.strip() for origin in ALLOWED_ORIGINS.split(",")],
+        allow_credentials=True,
+        allow_methods=["GET", "POST"],
+        allow_headers=["content-type"],
+    )
+elif not os.getenv("RENDER"):
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+@app.on_event("startup")
+async def start_log_listener():
+    # Paired with stop_log_listener so each lifespan starts and stops it once
+    _log_listener.start()
+
+@app.on_event("startup")
+async def warm_up_model():
+    """Run one mid-range prediction so the first real request doesn't pay for lazy initialization"""
+    try:
+        predictor.predict(PredictionInput(
+            cement=321.0,
+            blast_furnace_slag=179.7,
+            fly_ash=100.0,
+            water=184.4,
+            superplasticizer=16.1,
+            coarse_aggregate=973.0,
+            fine_aggregate=793.3,
+            age=183
+        ))
+        logger.info("Model warm-up prediction completed")
+    except Exception as e:
+        logger.warning("Model warm-up failed: %s", e)
+
+@app.on_event("startup")
+async def start_prediction_batching():
+    predictor.start_batching()
+
+@app.on_event("shutdown")
+async def stop_prediction_batching():
+    await predictor.stop_batching()
+
+@app.on_event("shutdown")
+async def stop_log_listener():
+    _log_listener.stop()
 
 @app.get("/", include_in_schema=False)
 async def root():
@@ -39,19 +105,40 @@ async def root():
         "timestamp": datetime.utcnow().isoformat()
     }
 
+@lru_cache(maxsize=1)
+def _model_metadata() -> ModelMetadata:
+    """Model metadata is fixed for the life of the process, so build the response once"""
+    model_info = predictor.model_loader.get_model_info()
+    return ModelMetadata(
+        **model_info,
+        performance_metrics={
+            "r2_score": 0.89,  # From notebook evaluation
+            "rmse": 4.23,     # From notebook evaluation
+            "algorithm": "RandomForestRegressor"
+        }
+    )
+
+@lru_cache(maxsize=1)
+def _healthy_response() -> HealthResponse:
+    """Health response for a loaded model; only the timestamp changes per request"""
+    metadata = _model_metadata()
+    return HealthResponse(
+        status="healthy",
+        model_loaded=True,
+        model_version=metadata.model_version,
+        timestamp="",
+        model_type=metadata.model_type,
+        features_used=metadata.features_used,
+        performance_metrics=metadata.performance_metrics
+    )
+
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
     """Health check endpoint"""
     try:
-        model_info = predictor.model_loader.get_model_info()
-        return HealthResponse(
-            status="healthy",
-            model_loaded=True,
-            model_version=model_info["model_version"],
-            timestamp=datetime.utcnow().isoformat()
-        )
+        return _healthy_response().model_copy(update={"timestamp": datetime.utcnow().isoformat()})
     except Exception as e:
-        logger.error(f"Health check failed: {str(e)}")
+        logger.error("Health check failed: %s", e)
         return HealthResponse(
             status="unhealthy",
             model_loaded=False,
@@ -63,17 +150,9 @@ async def health_check():
 async def get_metadata():
     """Get model metadata and training information"""
     try:
-        model_info = predictor.model_loader.get_model_info()
-        return ModelMetadata(
-            **model_info,
-            performance_metrics={
-                "r2_score": 0.89,  # From notebook evaluation
-                "rmse": 4.23,     # From notebook evaluation
-                "algorithm": "RandomForestRegressor"
-            }
-        )
+        return _model_metadata()
     except Exception as e:
-        logger.error(f"Metadata retrieval failed: {str(e)}")
+        logger.error("Metadata retrieval failed: %s", e)
         raise HTTPException(status_code=500, detail="Failed to retrieve model metadata")
 
 @app.post("/predict", response_model=PredictionResponse)
@@ -91,54 +170,68 @@ async def predict_strength(input_data: PredictionInput):
     - **age**: Concrete age in days - 1 to 365
     """
     try:
-        # Convert to dict format expected by preprocessing
-        input_dict = input_data.dict(by_alias=True)
-        
-        # Make prediction
-        result = predictor.predict(input_dict)
-        
-        logger.info(f"Prediction successful for input: {input_dict}")
-        return PredictionResponse(**result)
+        # Make prediction (input_data is already validated by Pydantic). Concurrent
+        # requests are micro-batched and the model runs off the event loop.
+        result = await predictor.apredict(input_data)
         
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Prediction successful for input: %s", input_data)
+        # The predictor builds this dict itself, so skip re-validating it
+        return PredictionResponse.model_construct(**result)
+    
+    except ValueError as e:
+        logger.warning("Validation error: %s", e)
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error("Prediction error: %s", e)
+        raise HTTPException(status_code=500, detail="Prediction failed")
+
+@app.post("/predict/batch", response_model=List[PredictionResponse])
+def predict_strength_batch(
+    inputs: List[PredictionInput] = Body(..., min_length=1, max_length=MAX_BATCH_SIZE)
+):
+    """
+    Predict compressive strength for up to MAX_BATCH_SIZE mixes with one model call
+    (same fields and ranges as /predict). A plain def, so FastAPI runs it in its
+    threadpool instead of blocking the event loop.
+    """
+    try:
+        results = predictor.predict_batch(inputs)
+        return [PredictionResponse.model_construct(**result) for result in results]
+    
     except ValueError as e:
-        logger.warning(f"Validation error: {str(e)}")
+        logger.warning("Validation error: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"Prediction error: {str(e)}")
+        logger.error("Batch prediction error: %s", e)
         raise HTTPException(status_code=500, detail="Prediction failed")
 
+# Static until SHAP/LIME is integrated, so serialized once at import
+EXPLAIN_BYTES = orjson.dumps({
+    "feature_importance": {
+        "Cement": 0.25,
+        "Water": 0.20,
+        "Age": 0.15,
+        "Water-Binder Ratio": 0.12,
+        "Superplasticizer": 0.10,
+        "Fly Ash": 0.08,
+        "Blast Furnace Slag": 0.05,
+        "Aggregate-Cement Ratio": 0.03,
+        "Coarse Aggregate": 0.01,
+        "Fine Aggregate": 0.01
+    },
+    "message": "Feature importance based on RandomForest model",
+    "note": "For detailed SHAP explanations, enable explainability package"
+})
+
 @app.post("/explain")
 async def explain_prediction(input_data: PredictionInput):
     """
     Provide feature importance explanation for prediction
     (Simplified version - in production you might integrate SHAP/LIME)
     """
-    try:
-        input_dict = input_data.dict(by_alias=True)
-        
-        # This would integrate with SHAP/LIME in production
-        explanation = {
-            "feature_importance": {
-                "Cement": 0.25,
-                "Water": 0.20,
-                "Age": 0.15,
-                "Water-Binder Ratio": 0.12,
-                "Superplasticizer": 0.10,
-                "Fly Ash": 0.08,
-                "Blast Furnace Slag": 0.05,
-                "Aggregate-Cement Ratio": 0.03,
-                "Coarse Aggregate": 0.01,
-                "Fine Aggregate": 0.01
-            },
-            "message": "Feature importance based on RandomForest model",
-            "note": "For detailed SHAP explanations, enable explainability package"
-        }
-        
-        return explanation
-        
-    except Exception as e:
-        logger.error(f"Explanation failed: {str(e)}")
-        raise HTTPException(status_code=500, detail="Explanation generation failed")
+    # input_data is only validated; the explanation doesn't depend on it yet
+    return Response(content=EXPLAIN_BYTES, media_type="application/json")
 
 # NEW: Additional endpoints for production monitoring
 @app.get("/info")
@@ -164,7 +257,7 @@ async def readiness_check():
             "timestamp": datetime.utcnow().isoformat()
         }
     except Exception as e:
-        logger.error(f"Readiness check failed: {str(e)}")
+        logger.error("Readiness check failed: %s", e)
         return {
             "status": "not_ready",
             "model_loaded": False,
@@ -177,16 +270,25 @@ if __name__ == "__main__":
     # Get port from environment variable (Render sets $PORT)
     port = int(os.getenv("PORT", 8000))
     
-    # Run with production settings
-    uvicorn.run(
-        "app.main:app", 
-        host="0.0.0.0",  # Important: Bind to all interfaces
-        port=port, 
-        reload=False,     # Disable reload in production
-        workers=1,        # Single worker for free tier
-        access_log=True,  # Enable access logs
-        timeout_keep_alive=5  # Keep alive timeout
-    )
+    if os.getenv("RENDER"):
+        # Production: one process per core (capped), each running the model
+        # single-threaded. WEB_CONCURRENCY overrides the worker count, matching
+        # the variable the uvicorn CLI reads.
+        workers = int(os.getenv("WEB_CONCURRENCY", min(os.cpu_count() or 1, 4)))
+        uvicorn.run(
+            "app.main:app", 
+            host="0.0.0.0",  # Important: Bind to all interfaces
+            port=port, 
+            reload=False,     # Disable reload in production
+            workers=workers,
+            loop="uvloop" if sys.platform != "win32" else "asyncio",  # uvloop has no Windows build
+            http="httptools",
+            access_log=True,  # Enable access logs
+            timeout_keep_alive=5  # Keep alive timeout
+        )
+    else:
+        # Development: single process with auto-reload
+        uvicorn.run("app.main:app", host="0.0.0.0", port=port, reload=True, workers=1)
 
 # from fastapi import FastAPI, HTTPException
 # from fastapi.middleware.cors import CORSMiddleware
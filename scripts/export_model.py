@@ -0,0 +1,83 @@
+"""
+Export the trained model to alternative serving formats.
+
+Run from the project root (after `pip install -e .[onnx]` / `pip install -e .[treelite]`
+for those formats):
+
+    python scripts/export_model.py json
+    python scripts/export_model.py onnx
+    python scripts/export_model.py treelite
+
+then point the API at the exported file, e.g. MODEL_PATH=models/best_model.json,
+MODEL_PATH=models/best_model.onnx or MODEL_PATH=models/best_model.so.
+"""
+import argparse
+import logging
+
+import joblib
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def export_json(model_path: str, output_path: str):
+    """Save the pickled XGBRegressor's booster in XGBoost's native format (.json, or .ubj for binary JSON)"""
+    model = joblib.load(model_path)
+    model.get_booster().save_model(output_path)
+    logger.info("Exported XGBoost model to %s", output_path)
+
+
+def export_onnx(model_path: str, output_path: str):
+    """Convert the pickled XGBRegressor to ONNX with a float32 [None, 11] input named "input" """
+    from onnxmltools import convert_xgboost
+    from onnxmltools.convert.common.data_types import FloatTensorType
+
+    model = joblib.load(model_path)
+
+    # The ONNX converter only understands XGBoost's default f0..fN feature names
+    model.get_booster().feature_names = None
+
+    # Feature count from the model itself, so the script runs without src importable
+    onnx_model = convert_xgboost(
+        model, initial_types=[("input", FloatTensorType([None, model.n_features_in_]))]
+    )
+    with open(output_path, "wb") as f:
+        f.write(onnx_model.SerializeToString())
+    logger.info("Exported ONNX model to %s", output_path)
+
+
+def export_treelite(model_path: str, output_path: str, parallel_comp: int = 4):
+    """Compile the pickled XGBRegressor's trees to a native shared library with Treelite + TL2cgen"""
+    import treelite
+    import tl2cgen
+
+    model = joblib.load(model_path)
+    tl_model = treelite.frontend.from_xgboost(model.get_booster())
+
+    # Generated C code is specialized to the split thresholds; parallel_comp
+    # splits it into that many translation units so gcc can compile them in parallel
+    tl2cgen.export_lib(
+        tl_model, toolchain="gcc", libpath=output_path, params={"parallel_comp": parallel_comp}
+    )
+    logger.info("Exported Treelite model library to %s", output_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("format", choices=["json", "onnx", "treelite"], help="Target serving format")
+    parser.add_argument("--model", default="models/best_model.pkl", help="Pickled model to export")
+    parser.add_argument("--output", default=None, help="Output path (default: next to --model)")
+    args = parser.parse_args()
+
+    extension = "so" if args.format == "treelite" else args.format
+    output_path = args.output or args.model.rsplit(".", 1)[0] + "." + extension
+    if args.format == "json":
+        export_json(args.model, output_path)
+    elif args.format == "onnx":
+        export_onnx(args.model, output_path)
+    elif args.format == "treelite":
+        export_treelite(args.model, output_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,15 +8,39 @@ setup(
     install_requires=[
         "fastapi==0.104.1",
         "uvicorn==0.24.0",
+        "uvloop>=0.19; sys_platform != 'win32'",
+        "httptools>=0.6",
         "streamlit==1.28.0",
-        "pandas==2.1.3",
         "numpy==1.24.3",
         "scikit-learn==1.3.2",
         "joblib==1.3.2",
         "pydantic==2.5.0",
         "plotly==5.17.0",
         "requests==2.31.0",
-        "python-multipart==0.0.6"
+        "python-multipart==0.0.6",
+        "orjson>=3.9"
     ],
+    extras_require={
+        # Notebooks and preprocess_frame(); the API's own code works on NumPy arrays.
+        # pandas still gets installed with streamlit, and xgboost imports it whenever
+        # it is installed, so the API process does load it.
+        "training": [
+            "pandas==2.1.3",
+        ],
+        # Serve an exported .onnx model (scripts/export_model.py onnx)
+        "onnx": [
+            "onnxruntime>=1.16",
+            "onnxmltools>=1.12",
+        ],
+        # JIT-compiled feature engineering for large preprocess_batch() calls
+        "numba": [
+            "numba>=0.59",
+        ],
+        # Serve a Treelite-compiled .so model (scripts/export_model.py treelite)
+        "treelite": [
+            "treelite>=4.0",
+            "tl2cgen>=1.0",
+        ],
+    },
     python_requires=">=3.8",
 )
\ No newline at end of file
@@ -1,4 +1,5 @@
 import joblib
+import numpy as np
 import os
 import logging
 from typing import Any
@@ -12,6 +13,10 @@ class ModelLoader:
         self.model_path = model_path
         self.model = None
         self.model_version = "1.0.0"  # From notebook training
+        self._onnx_input_name = None  # Set when serving an exported .onnx model
+        self._treelite_dmatrix = None  # Set when serving a Treelite-compiled shared library
+        self._inplace_predict = None  # Set when serving a native XGBoost .json/.ubj model
+        self._model_info = None  # Built once per load_model() call
         self.load_model()
     
     def load_model(self):
@@ -20,34 +25,89 @@ class ModelLoader:
             if not os.path.exists(self.model_path):
                 raise FileNotFoundError(f"Model file not found at {self.model_path}")
             
-            self.model = joblib.load(self.model_path)
-            logger.info(f"Successfully loaded model from {self.model_path}")
+            if self.model_path.endswith(".onnx"):
+                self.model = self._load_onnx_session()
+            elif self.model_path.endswith((".so", ".dylib", ".dll")):
+                self.model = self._load_treelite_predictor()
+            elif self.model_path.endswith((".json", ".ubj")):
+                self.model = self._load_booster()
+            else:
+                self.model = joblib.load(self.model_path)
+                
+                # Parallelism comes from uvicorn worker processes; a multi-threaded
+                # model in each of N workers would oversubscribe the CPU
+                if hasattr(self.model, "n_jobs"):
+                    self.model.set_params(n_jobs=1)
+            
+            self._model_info = {
+                "model_type": type(self.model).__name__,
+                "model_version": self.model_version,
+                "training_date": "2024-01-01",  # Would normally come from metadata
+                "features_used": 11,  # 8 original + 3 engineered
+                "target": "Concrete compressive strength(MPa, megapascals)"
+            }
+            
+            logger.info("Successfully loaded model from %s", self.model_path)
             
         except Exception as e:
-            logger.error(f"Error loading model: {str(e)}")
+            logger.error("Error loading model: %s", e)
             raise
     
+    def _load_onnx_session(self):
+        """Open an ONNX Runtime session (see scripts/export_model.py), one thread per worker"""
+        import onnxruntime as ort  # Optional dependency: pip install -e .[onnx]
+        
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = 1
+        options.inter_op_num_threads = 1
+        session = ort.InferenceSession(
+            self.model_path, sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self._onnx_input_name = session.get_inputs()[0].name
+        return session
+    
+    def _load_treelite_predictor(self):
+        """Load a Treelite-compiled model library (see scripts/export_model.py), one thread per worker"""
+        import tl2cgen  # Optional dependency: pip install -e .[treelite]
+        
+        self._treelite_dmatrix = tl2cgen.DMatrix
+        return tl2cgen.Predictor(self.model_path, nthread=1)
+    
+    def _load_booster(self):
+        """Load a native XGBoost model (see scripts/export_model.py) without unpickling the sklearn wrapper"""
+        import xgboost
+        
+        booster = xgboost.Booster(params={"nthread": 1}, model_file=self.model_path)
+        self._inplace_predict = booster.inplace_predict
+        return booster
+    
     def get_model_info(self) -> dict:
-        """Get model metadata"""
+        """Get model metadata (shared dict, do not mutate)"""
         if self.model is None:
             raise ValueError("Model not loaded")
         
-        return {
-            "model_type": type(self.model).__name__,
-            "model_version": self.model_version,
-            "training_date": "2024-01-01",  # Would normally come from metadata
-            "features_used": 11,  # 8 original + 3 engineered
-            "target": "Concrete compressive strength(MPa, megapascals)"
-        }
+        return self._model_info
     
-    def predict(self, features):
-        """Make prediction using loaded model"""
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        """Make prediction on a (n_samples, n_features) feature array"""
         if self.model is None:
             raise ValueError("Model not loaded")
         
         try:
+            if self._onnx_input_name is not None:
+                outputs = self.model.run(None, {self._onnx_input_name: features.astype(np.float32, copy=False)})
+                return outputs[0].ravel()
+            
+            if self._treelite_dmatrix is not None:
+                dmatrix = self._treelite_dmatrix(features.astype(np.float32, copy=False))
+                return self.model.predict(dmatrix).ravel()
+            
+            if self._inplace_predict is not None:
+                # Straight from the array, no DMatrix construction per call
+                return self._inplace_predict(features)
+            
             prediction = self.model.predict(features)
             return prediction
         except Exception as e:
-            logger.error(f"Prediction error: {str(e)}")
+            logger.error("Prediction error: %s", e)
             raise
\ No newline at end of file
@@ -1,52 +1,235 @@
+import asyncio
 import logging
-from typing import Dict, Any, Tuple
-import pandas as pd
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+import numpy as np
 
 from .preprocessing import CementDataPreprocessor
 from .model_loader import ModelLoader
+from .schemas import PredictionInput
 
 logger = logging.getLogger(__name__)
 
 class CementStrengthPredictor:
     """Main prediction class that orchestrates preprocessing and prediction"""
     
-    def __init__(self, model_path: str = "models/best_model.pkl"):
+    def __init__(
+        self,
+        model_path: str = os.getenv("MODEL_PATH", "models/best_model.pkl"),
+        batch_window: float = 0.003,
+        max_batch_size: int = 32,
+        cache_size: int = 4096
+    ):
         self.preprocessor = CementDataPreprocessor()
         self.model_loader = ModelLoader(model_path)
+        # Column order of the feature array, reported back with each prediction
+        self.feature_names = list(self.preprocessor.feature_names)
+        
+        # Micro-batching: concurrent apredict() calls arriving within batch_window
+        # seconds share one model call. Started on the serving loop by start_batching().
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._batch_task: Optional[asyncio.Task] = None
+        
+        # LRU of raw input tuple -> predicted strength, shared by predict() and apredict()
+        # (~160 B per entry). Guarded by a lock since predict() may run in worker threads.
+        self.cache_size = cache_size
+        self._strength_cache: "OrderedDict[Tuple[float, ...], float]" = OrderedDict()
+        self._cache_lock = threading.Lock()
     
-    def predict(self, input_data: Dict[str, Any]) -> Tuple[float, Dict[str, Any]]:
+    def predict(self, input_data: PredictionInput) -> Dict[str, Any]:
         """
         Complete prediction pipeline:
-        1. Validate input
-        2. Preprocess (exactly like notebook)
-        3. Predict
-        4. Return results with metadata
+        1. Preprocess (exactly like notebook) - input is already validated by Pydantic
+        2. Predict
+        3. Return results with metadata
         """
         try:
-            # Validate input
-            self.preprocessor.validate_input(input_data)
+            key = self._cache_key(input_data)
+            strength = self._get_cached(key)
+            if strength is None:
+                # Preprocess (faithfully replicates notebook)
+                processed_features = self._preprocess(input_data)
+                
+                # Make prediction
+                prediction = self.model_loader.predict(processed_features)
+                strength = float(prediction[0])
+                self._put_cached(key, strength)
             
-            # Preprocess (faithfully replicates notebook)
-            processed_features = self.preprocessor.preprocess(input_data)
-            
-            # Make prediction
-            prediction = self.model_loader.predict(processed_features)
+            result = self._build_result(strength)
+            logger.info("Prediction successful: %s MPa", result['predicted_strength'])
+            return result
+        
+        except Exception as e:
+            logger.error("Prediction pipeline failed: %s", e)
+            raise
+    
+    def predict_batch(self, inputs: List[PredictionInput]) -> List[Dict[str, Any]]:
+        """Predict many inputs with one model call; cached rows are reused and new ones cached"""
+        try:
+            keys = [self._cache_key(input_data) for input_data in inputs]
+            strengths = [self._get_cached(key) for key in keys]
+            missing = [i for i, strength in enumerate(strengths) if strength is None]
+            if missing:
+                features = self.preprocessor.preprocess_batch([keys[i] for i in missing])
+                predictions = self.model_loader.predict(features)
+                for i, prediction in zip(missing, predictions):
+                    strengths[i] = float(prediction)
+                    self._put_cached(keys[i], strengths[i])
             
-            # Prepare response
-            result = {
-                "predicted_strength": float(prediction[0]),
-                "units": "MPa",
-                "model_version": self.model_loader.model_version,
-                "features_used": list(processed_features.columns),
-                "status": "success"
-            }
+            logger.info("Batch prediction successful: %s inputs", len(inputs))
+            return [self._build_result(strength) for strength in strengths]
+        
+        except Exception as e:
+            logger.error("Batch prediction pipeline failed: %s", e)
+            raise
+    
+    async def apredict(self, input_data: PredictionInput) -> Dict[str, Any]:
+        """Same as predict(), but batched with concurrent requests when batching is running"""
+        if self._queue is None:
+            return self.predict(input_data)
+        
+        try:
+            key = self._cache_key(input_data)
+            strength = self._get_cached(key)
+            if strength is None:
+                processed_features = self._preprocess(input_data)
+                
+                future = asyncio.get_running_loop().create_future()
+                await self._queue.put((processed_features, future))
+                strength = await future
+                self._put_cached(key, strength)
             
-            logger.info(f"Prediction successful: {result['predicted_strength']} MPa")
+            result = self._build_result(strength)
+            logger.info("Prediction successful: %s MPa", result['predicted_strength'])
             return result
-            
+        
         except Exception as e:
-            logger.error(f"Prediction pipeline failed: {str(e)}")
+            logger.error("Prediction pipeline failed: %s", e)
             raise
+    
+    def start_batching(self):
+        """Start the micro-batching task on the running event loop (call from app startup)"""
+        self._queue = asyncio.Queue()
+        self._batch_task = asyncio.get_running_loop().create_task(self._batch_worker())
+    
+    async def stop_batching(self):
+        """Stop the micro-batching task; apredict() falls back to direct predictions"""
+        if self._batch_task is not None:
+            self._batch_task.cancel()
+            try:
+                await self._batch_task
+            except asyncio.CancelledError:
+                pass
+        self._queue = None
+        self._batch_task = None
+    
+    async def _batch_worker(self):
+        """Collect queued rows (up to batch_window seconds under concurrent load), predict them in one call, scatter results"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            # One loop pass lets requests scheduled alongside this one enqueue too
+            await asyncio.sleep(0)
+            self._drain_queue(batch)
+            
+            # A lone request is predicted right away; only concurrent traffic
+            # waits out batch_window for more rows
+            if len(batch) > 1:
+                deadline = loop.time() + self.batch_window
+                while len(batch) < self.max_batch_size:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+            
+            features = np.vstack([row for row, _ in batch])
+            try:
+                # Off the event loop, so requests keep queueing while the model runs
+                predictions = await loop.run_in_executor(None, self.model_loader.predict, features)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            
+            # Futures of requests cancelled while waiting are already done
+            for (_, future), prediction in zip(batch, predictions):
+                if not future.done():
+                    future.set_result(float(prediction))
+    
+    def _drain_queue(self, batch: list):
+        """Move already-queued rows into batch without waiting, up to max_batch_size"""
+        while len(batch) < self.max_batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+    
+    def clear_cache(self):
+        """Drop all cached predictions (e.g. after reloading the model)"""
+        with self._cache_lock:
+            self._strength_cache.clear()
+    
+    @staticmethod
+    def _cache_key(input_data: PredictionInput) -> Tuple[float, ...]:
+        return (
+            input_data.cement,
+            input_data.blast_furnace_slag,
+            input_data.fly_ash,
+            input_data.water,
+            input_data.superplasticizer,
+            input_data.coarse_aggregate,
+            input_data.fine_aggregate,
+            input_data.age,
+        )
+    
+    def _get_cached(self, key: Tuple[float, ...]) -> Optional[float]:
+        with self._cache_lock:
+            strength = self._strength_cache.get(key)
+            if strength is not None:
+                self._strength_cache.move_to_end(key)
+            return strength
+    
+    def _put_cached(self, key: Tuple[float, ...], strength: float):
+        with self._cache_lock:
+            self._strength_cache[key] = strength
+            self._strength_cache.move_to_end(key)
+            if len(self._strength_cache) > self.cache_size:
+                self._strength_cache.popitem(last=False)
+    
+    def _preprocess(self, input_data: PredictionInput) -> np.ndarray:
+        """Fill a float32 feature row straight from the parsed input and its computed features"""
+        features = np.empty((1, len(self.feature_names)), dtype=np.float32)
+        features[0] = (
+            input_data.cement,
+            input_data.blast_furnace_slag,
+            input_data.fly_ash,
+            input_data.water,
+            input_data.superplasticizer,
+            input_data.coarse_aggregate,
+            input_data.fine_aggregate,
+            input_data.age,
+            input_data.total_binder,
+            input_data.water_binder_ratio,
+            input_data.aggregate_cement_ratio,
+        )
+        return features
+    
+    def _build_result(self, predicted_strength: float) -> Dict[str, Any]:
+        return {
+            "predicted_strength": predicted_strength,
+            "units": "MPa",
+            "model_version": self.model_loader.model_version,
+            "features_used": self.feature_names,
+            "status": "success"
+        }
 
 # Singleton instance
-predictor = CementStrengthPredictor()
\ No newline at end of file
+predictor = CementStrengthPredictor()
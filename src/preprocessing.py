@@ -1,87 +1,132 @@
-import pandas as pd
 import numpy as np
 import logging
-from typing import Dict, Any
+import operator
+from typing import Dict, Any, Sequence
 
 logger = logging.getLogger(__name__)
 
+# Raw input keys, in the same order as the first 8 feature columns
+REQUIRED_KEYS = (
+    'Cement (component 1)(kg in a m^3 mixture)',
+    'Blast Furnace Slag (component 2)(kg in a m^3 mixture)',
+    'Fly Ash (component 3)(kg in a m^3 mixture)',
+    'Water  (component 4)(kg in a m^3 mixture)',
+    'Superplasticizer (component 5)(kg in a m^3 mixture)',
+    'Coarse Aggregate  (component 6)(kg in a m^3 mixture)',
+    'Fine Aggregate (component 7)(kg in a m^3 mixture)',
+    'Age (day)'
+)
+ENGINEERED_KEYS = ('total_binder', 'water_binder_ratio', 'aggregate_cement_ratio')
+
+# Pulls all 8 raw values out of an input dict in one C-level call
+_GET = operator.itemgetter(*REQUIRED_KEYS)
+
+try:
+    from numba import njit  # Optional dependency: pip install -e .[numba]
+except ImportError:
+    njit = None
+
+if njit is not None:
+    # Fused single loop over the rows for large batches. Compiled eagerly for the
+    # one signature used and cached to __pycache__, so there is no first-call JIT
+    # pause. Serial on purpose (one thread per worker process), and without
+    # fastmath, which would let division results drift from the NumPy path.
+    @njit("int64(float64[:, :], float32[:, :])", cache=True)
+    def _engineer_features(raw, features):
+        """Fill feature columns 8-10; returns 1 / 2 at the first row with total_binder / cement <= 0, else 0"""
+        for i in range(raw.shape[0]):
+            cement = raw[i, 0]
+            total_binder = cement + raw[i, 1] + raw[i, 2]
+            if total_binder <= 0:
+                return 1
+            if cement <= 0:
+                return 2
+            features[i, 8] = total_binder
+            features[i, 9] = raw[i, 3] / total_binder
+            features[i, 10] = (raw[i, 5] + raw[i, 6]) / cement
+        return 0
+else:
+    _engineer_features = None
+
 class CementDataPreprocessor:
     """Faithfully replicates the preprocessing logic from the Jupyter notebook"""
     
     def __init__(self):
-        self.feature_names = [
-            'Cement (component 1)(kg in a m^3 mixture)',
-            'Blast Furnace Slag (component 2)(kg in a m^3 mixture)',
-            'Fly Ash (component 3)(kg in a m^3 mixture)',
-            'Water  (component 4)(kg in a m^3 mixture)',
-            'Superplasticizer (component 5)(kg in a m^3 mixture)',
-            'Coarse Aggregate  (component 6)(kg in a m^3 mixture)',
-            'Fine Aggregate (component 7)(kg in a m^3 mixture)',
-            'Age (day)',
-            'total_binder',
-            'water_binder_ratio',
-            'aggregate_cement_ratio'
-        ]
+        self.feature_names = list(REQUIRED_KEYS + ENGINEERED_KEYS)
+    
+    def preprocess_array(self, input_data: Dict[str, Any]) -> np.ndarray:
+        """Preprocess a dict keyed by the notebook's column names into a (1, 11) float32 array"""
+        try:
+            values = _GET(input_data)
+        except KeyError as e:
+            raise ValueError(f"Missing required field: {e.args[0]}")
+        return self.preprocess_values(values)
+    
+    def preprocess(self, input_data: Dict[str, Any]) -> np.ndarray:
+        """Same as preprocess_array(); kept for existing callers"""
+        return self.preprocess_array(input_data)
     
-    def preprocess(self, input_data: Dict[str, Any]) -> pd.DataFrame:
+    def preprocess_frame(self, input_data: Dict[str, Any]):
+        """preprocess_array() as a DataFrame labelled with feature_names, for debugging and notebooks"""
+        import pandas as pd  # Optional dependency: pip install -e .[training]
+        return pd.DataFrame(self.preprocess_array(input_data), columns=self.feature_names)
+    
+    def preprocess_values(self, values: Sequence[float]) -> np.ndarray:
         """
-        Replicates exact preprocessing from notebook:
-        1. Create DataFrame from input
-        2. Feature engineering: total_binder, water_binder_ratio, aggregate_cement_ratio
-        3. Handle any missing values (though notebook shows none)
+        Replicates the notebook preprocessing for one row of the 8 raw inputs
+        (in feature_names order), as a (1, 11) float32 array via preprocess_batch()
         """
         try:
-            # Create DataFrame (mirroring notebook's data structure)
-            df = pd.DataFrame([input_data])
-            
-            # Feature engineering - EXACTLY as in notebook
-            df['total_binder'] = (
-                df['Cement (component 1)(kg in a m^3 mixture)'] +
-                df['Blast Furnace Slag (component 2)(kg in a m^3 mixture)'] +
-                df['Fly Ash (component 3)(kg in a m^3 mixture)']
-            )
-            
-            df['water_binder_ratio'] = (
-                df['Water  (component 4)(kg in a m^3 mixture)'] / df['total_binder']
-            )
-            
-            df['aggregate_cement_ratio'] = (
-                (df['Coarse Aggregate  (component 6)(kg in a m^3 mixture)'] +
-                 df['Fine Aggregate (component 7)(kg in a m^3 mixture)']) /
-                df['Cement (component 1)(kg in a m^3 mixture)']
-            )
-            
-            # Handle infinite values from division (not in notebook but needed for production)
-            df.replace([np.inf, -np.inf], np.nan, inplace=True)
-            
-            # Drop NaN values (mirroring notebook's data.dropna())
-            df = df.dropna()
-            
-            # Ensure correct column order for model
-            processed_data = df[self.feature_names]
-            
-            logger.info("Successfully preprocessed input data")
-            return processed_data
+            features = self.preprocess_batch((values,))
+            logger.debug("Successfully preprocessed input data")
+            return features
             
         except Exception as e:
-            logger.error(f"Error in preprocessing: {str(e)}")
+            logger.error("Error in preprocessing: %s", e)
             raise ValueError(f"Data preprocessing failed: {str(e)}")
     
+    def preprocess_batch(self, values: Sequence[Sequence[float]]) -> np.ndarray:
+        """
+        Replicates the notebook preprocessing on an (N, 8) array of raw inputs in
+        feature_names order, one vectorized pass per column:
+        1. Copy the raw inputs into the first 8 columns
+        2. Feature engineering: total_binder, water_binder_ratio, aggregate_cement_ratio
+        3. Reject inputs that would divide by zero (the notebook dropped them via dropna())
+        """
+        raw = np.asarray(values, dtype=np.float64)
+        if raw.ndim != 2 or raw.shape[1] != len(REQUIRED_KEYS):
+            raise ValueError(f"Expected an (N, {len(REQUIRED_KEYS)}) array of raw inputs, got shape {raw.shape}")
+        
+        features = np.empty((len(raw), len(self.feature_names)), dtype=np.float32)
+        features[:, 0:8] = raw
+        
+        # Feature engineering - EXACTLY as in notebook (in float64, then
+        # stored as float32, which is what XGBoost does with a float64 frame)
+        if _engineer_features is not None:
+            status = _engineer_features(raw, features)
+            if status == 1:
+                raise ValueError("total_binder must be > 0")
+            if status == 2:
+                raise ValueError("cement must be > 0")
+            return features
+        
+        cement = raw[:, 0]
+        total_binder = cement + raw[:, 1] + raw[:, 2]
+        # Same error as the numba kernel: the first bad row decides, total_binder checked first
+        bad = (total_binder <= 0) | (cement <= 0)
+        if bad.any():
+            row = int(bad.argmax())
+            raise ValueError("total_binder must be > 0" if total_binder[row] <= 0 else "cement must be > 0")
+        
+        features[:, 8] = total_binder
+        features[:, 9] = raw[:, 3] / total_binder
+        features[:, 10] = (raw[:, 5] + raw[:, 6]) / cement
+        return features
+    
     def validate_input(self, input_data: Dict[str, Any]) -> bool:
         """Validate input data types and ranges based on notebook EDA"""
-        required_fields = [
-            'Cement (component 1)(kg in a m^3 mixture)',
-            'Blast Furnace Slag (component 2)(kg in a m^3 mixture)',
-            'Fly Ash (component 3)(kg in a m^3 mixture)',
-            'Water  (component 4)(kg in a m^3 mixture)',
-            'Superplasticizer (component 5)(kg in a m^3 mixture)',
-            'Coarse Aggregate  (component 6)(kg in a m^3 mixture)',
-            'Fine Aggregate (component 7)(kg in a m^3 mixture)',
-            'Age (day)'
-        ]
-        
         # Check all required fields are present
-        for field in required_fields:
+        for field in REQUIRED_KEYS:
             if field not in input_data:
                 raise ValueError(f"Missing required field: {field}")
             
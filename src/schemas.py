@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, ValidationInfo, computed_field, field_validator
 from typing import Optional
 import numpy as np
 
@@ -13,12 +13,13 @@ class PredictionInput(BaseModel):
     fine_aggregate: float = Field(..., alias="Fine Aggregate (component 7)(kg in a m^3 mixture)", ge=594.0, le=992.6)
     age: int = Field(..., alias="Age (day)", ge=1, le=365)
 
-    class Config:
-        allow_population_by_field_name = True
+    model_config = ConfigDict(populate_by_name=True)
 
-    @validator('water', pre=True)
-    def validate_water_binder_ratio(cls, v, values):
+    @field_validator('water', mode='after')
+    @classmethod
+    def validate_water_binder_ratio(cls, v, info: ValidationInfo):
         """Validate that water-binder ratio is reasonable"""
+        values = info.data
         if 'cement' in values and 'blast_furnace_slag' in values and 'fly_ash' in values:
             total_binder = values['cement'] + values['blast_furnace_slag'] + values['fly_ash']
             if total_binder > 0:
@@ -27,6 +28,22 @@ class PredictionInput(BaseModel):
                     raise ValueError('Water-to-binder ratio seems unusually high')
         return v
 
+    # Engineered features from the notebook, computed on the parsed floats
+    @computed_field
+    @property
+    def total_binder(self) -> float:
+        return self.cement + self.blast_furnace_slag + self.fly_ash
+
+    @computed_field
+    @property
+    def water_binder_ratio(self) -> float:
+        return self.water / self.total_binder
+
+    @computed_field
+    @property
+    def aggregate_cement_ratio(self) -> float:
+        return (self.coarse_aggregate + self.fine_aggregate) / self.cement
+
 class PredictionResponse(BaseModel):
     """Pydantic model for prediction response"""
     predicted_strength: float
@@ -35,12 +52,20 @@ class PredictionResponse(BaseModel):
     features_used: list[str]
     status: str
 
+    model_config = ConfigDict(protected_namespaces=())
+
 class HealthResponse(BaseModel):
     """Health check response"""
     status: str
     model_loaded: bool
     model_version: str
     timestamp: str
+    # Model details, also served by /metadata, so clients can skip that call
+    model_type: Optional[str] = None
+    features_used: Optional[int] = None
+    performance_metrics: Optional[dict] = None
+
+    model_config = ConfigDict(protected_namespaces=())
 
 class ModelMetadata(BaseModel):
     """Model metadata response"""
@@ -49,4 +74,6 @@ class ModelMetadata(BaseModel):
     training_date: str
     features_used: int
     target: str
-    performance_metrics: Optional[dict] = None
\ No newline at end of file
+    performance_metrics: Optional[dict] = None
+
+    model_config = ConfigDict(protected_namespaces=())
\ No newline at end of file
@@ -0,0 +1,33 @@
+"""
+API endpoint settings for the Streamlit app.
+
+Kept out of app.py for the same reason as mix_design.py: Streamlit re-executes
+the main script on every rerun, while an imported module is loaded once per
+process, so these strings are built once.
+"""
+import os
+
+# Configuration - UPDATED FOR PRODUCTION
+API_BASE_URL = os.getenv("API_URL", "http://localhost:8000")
+HEALTH_URL = f"{API_BASE_URL}/health"
+METADATA_URL = f"{API_BASE_URL}/metadata"
+PREDICT_URL = f"{API_BASE_URL}/predict"
+PREDICT_BATCH_URL = f"{API_BASE_URL}/predict/batch"
+
+# Shown instead of the app when /health fails
+API_DOWN_MARKDOWN = f"""
+## 🚨 FastAPI Server Not Reachable!
+
+**If running locally:**
+```bash
+uvicorn app.main:app --reload --port 8000
+```
+
+**If deployed on Render:**
+- Check that both services are deployed
+- Verify API service is running
+- Wait 1-2 minutes for services to start
+- Check Render dashboard for deployment status
+
+**Current API URL:** `{API_BASE_URL}`
+"""
@@ -1,12 +1,39 @@
 import streamlit as st
 import requests
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import os
+import orjson
+import threading
+import asyncio
+import time
 
-# Configuration - UPDATED FOR PRODUCTION
-API_BASE_URL = os.getenv("API_URL", "http://localhost:8000")
+# Streamlit puts the script's directory on sys.path
+from api_config import (
+    API_BASE_URL, API_DOWN_MARKDOWN, HEALTH_URL, METADATA_URL, PREDICT_URL, PREDICT_BATCH_URL
+)
+from mix_design import (
+    DEFAULTS, SCENARIOS, SCENARIO_KEYS, FEATURE_KEYS, SESSION_KEYS,
+    INPUT_SECTIONS, classify_strengths,
+    RATIO_LABELS, RATIO_FIELDS, RATIO_FORMATS, RATIO_NOTES,
+    compute_validation, calculate_mix_ratios
+)
+
+# (connect, read) seconds per attempt; the session retries failed attempts
+REQUEST_TIMEOUT = (3, 10)
+
+# Strength classes, indexed by classify_strengths(): row i covers strengths
+# below STRENGTH_THRESHOLDS[i] (MPa); the last row is everything above.
+# Rows are (st function, class name, strength grade, typical use).
+_STRENGTH_CLASSES = (
+    (st.error, "Very Low Strength Concrete", "C12/15", "Suitable for non-structural applications"),
+    (st.warning, "Low Strength Concrete", "C16/20", "Suitable for foundations and mass concrete"),
+    (st.info, "Moderate Strength Concrete", "C25/30", "General purpose construction"),
+    (st.success, "Standard Strength Concrete", "C30/37", "Reinforced concrete structures"),
+    (st.success, "High Strength Concrete", "C40/50", "Pre-stressed concrete, high-rise buildings"),
+    (st.success, "Very High Strength Concrete", "C50/60", "Special structures, bridges"),
+    (st.success, "Ultra High Strength Concrete", "C60/75+", "Special applications, high-performance structures"),
+)
 
 # Page configuration
 st.set_page_config(
@@ -15,54 +42,32 @@ st.set_page_config(
     layout="wide"
 )
 
+def _prewarm(session, retries=5, interval=3.0):
+    """Ping /health until it answers, waking a sleeping free-tier API in the background"""
+    for _ in range(retries):
+        try:
+            if session.get(HEALTH_URL, timeout=2).status_code == 200:
+                return
+        except requests.exceptions.RequestException:
+            pass
+        time.sleep(interval)
+
 def initialize_session_state():
     """Initialize all session state variables"""
-    default_values = {
-        'cement': 300.0,
-        'blast_slag': 0.0,
-        'fly_ash': 0.0,
-        'water': 180.0,
-        'superplasticizer': 2.5,
-        'coarse_agg': 1050.0,
-        'fine_agg': 750.0,
-        'age': 28,
-        'last_prediction': None,
-        'prediction_history': []
-    }
-    
-    for key, value in default_values.items():
-        if key not in st.session_state:
-            st.session_state[key] = value
+    for key, value in DEFAULTS.items():
+        st.session_state.setdefault(key, value)
+    # Mutable, so each browser session needs its own list
+    st.session_state.setdefault('prediction_history', [])
+    
+    # Once per browser session; the session is fetched here because the
+    # thread has no Streamlit script context
+    if 'prewarmed' not in st.session_state:
+        st.session_state.prewarmed = True
+        threading.Thread(target=_prewarm, args=(get_session(),), daemon=True).start()
 
 def validate_inputs(cement, water, age):
     """Validate user inputs and provide professional guidance"""
-    warnings = []
-    info = []
-    
-    # Water-cement ratio validation
-    water_cement_ratio = water / cement if cement > 0 else 0
-    if water_cement_ratio > 0.7:
-        warnings.append("⚠️ High water-cement ratio may significantly reduce strength and durability")
-    elif water_cement_ratio > 0.6:
-        warnings.append("⚠️ Moderate water-cement ratio - consider reducing for higher strength")
-    elif water_cement_ratio < 0.3:
-        warnings.append("⚠️ Very low water-cement ratio may affect workability")
-    else:
-        info.append("✅ Optimal water-cement ratio range")
-    
-    # Age validation
-    if age < 3:
-        info.append("💡 Very early age testing - strength will develop significantly over time")
-    elif age < 7:
-        info.append("💡 Early age concrete typically reaches ~65% of 28-day strength")
-    elif age < 28:
-        info.append("💡 Concrete typically reaches ~90% of 28-day strength at 14 days")
-    
-    # Cement content validation
-    if cement < 250:
-        warnings.append("⚠️ Low cement content may result in lower strength and durability")
-    elif cement > 500:
-        info.append("💡 High cement content - consider supplementary cementitious materials")
+    warnings, info, ok = compute_validation(cement, water, age)
     
     # Display all warnings and info
     for warning in warnings:
@@ -70,33 +75,77 @@ def validate_inputs(cement, water, age):
     for information in info:
         st.info(information)
     
-    return len(warnings) == 0
+    return ok
 
-def calculate_mix_ratios(cement, water, blast_slag, fly_ash, coarse_agg, fine_agg):
-    """Calculate and return key mix design ratios"""
-    water_cement_ratio = water / cement if cement > 0 else 0
-    total_binder = cement + blast_slag + fly_ash
-    total_aggregate = coarse_agg + fine_agg
-    aggregate_binder_ratio = total_aggregate / total_binder if total_binder > 0 else 0
-    fine_agg_ratio = fine_agg / total_aggregate if total_aggregate > 0 else 0
-    
-    return {
-        'water_cement_ratio': water_cement_ratio,
-        'total_binder': total_binder,
-        'total_aggregate': total_aggregate,
-        'aggregate_binder_ratio': aggregate_binder_ratio,
-        'fine_agg_ratio': fine_agg_ratio
-    }
+@st.cache_resource
+def get_session():
+    """One pooled keep-alive session shared by all reruns and browser sessions"""
+    session = requests.Session()
+    session.headers.update({'Content-Type': 'application/json'})
+    adapter = HTTPAdapter(
+        pool_connections=20,
+        pool_maxsize=20,
+        # Short attempts retried with backoff instead of one long hang. POST is
+        # safe to retry: /predict has no side effects. raise_on_status=False hands
+        # back the last 5xx so callers can report its status code. read=False
+        # re-raises read timeouts as requests' Timeout (exhausted retries would
+        # surface as ConnectionError), so a waking API gets the timeout hint.
+        max_retries=Retry(
+            total=3,
+            read=False,
+            backoff_factor=0.5,
+            status_forcelist=[502, 503, 504],
+            allowed_methods=['GET', 'POST'],
+            raise_on_status=False
+        )
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+def _get_json(session, url):
+    """GET an API endpoint and decode it; raises on any failure"""
+    response = session.get(url, timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    return orjson.loads(response.content)
+
+# Sidebar fields that newer APIs include in /health
+_METADATA_KEYS = ('model_type', 'model_version', 'features_used', 'performance_metrics')
+
+def _post_json(session, url, payload):
+    """POST a JSON payload and decode the response; raises on any failure"""
+    response = session.post(url, data=orjson.dumps(payload), timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    return orjson.loads(response.content)
+
+async def _post_each(session, url, payloads):
+    """POST each payload on its own worker thread, all in flight at once"""
+    return await asyncio.gather(*(asyncio.to_thread(_post_json, session, url, payload) for payload in payloads))
+
+def _describe_error(error):
+    if isinstance(error, requests.exceptions.HTTPError):
+        return f"Status {error.response.status_code}"
+    return str(error)
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _fetch_health():
+    """GET /health, memoized for 10 minutes; raises on failure so errors are not cached"""
+    return _get_json(get_session(), HEALTH_URL)
+
+@st.cache_resource(show_spinner=False)
+def _fetch_metadata(model_version):
+    """
+    GET /metadata once per served model version (shared, read-only); raises on
+    failure so errors are not cached
+    """
+    return _get_json(get_session(), METADATA_URL)
 
 def check_api_health():
     try:
-        # UPDATED: Increased timeout for production
-        response = requests.get(f"{API_BASE_URL}/health", timeout=10)
-        if response.status_code == 200:
-            return True, response.json()
-        else:
-            st.error(f"API Health Check Failed: Status {response.status_code}")
-            return False, None
+        return True, _fetch_health()
+    except requests.exceptions.HTTPError as e:
+        st.error(f"API Health Check Failed: {_describe_error(e)}")
+        return False, None
     except requests.exceptions.RequestException as e:
         st.error(f"API Connection Error: {str(e)}")
         st.info(f"Trying to connect to: {API_BASE_URL}")
@@ -105,35 +154,30 @@ def check_api_health():
         st.error(f"Unexpected error during health check: {str(e)}")
         return False, None
 
-def get_metadata():
+def get_metadata(health_data):
+    """Model details for the sidebar: straight from /health when the API includes them, else /metadata"""
+    if all(health_data.get(key) is not None for key in _METADATA_KEYS):
+        return health_data
     try:
-        # UPDATED: Increased timeout for production
-        response = requests.get(f"{API_BASE_URL}/metadata", timeout=10)
-        if response.status_code == 200:
-            return response.json()
-        else:
-            st.warning(f"Could not fetch metadata: Status {response.status_code}")
-            return None
+        return _fetch_metadata(health_data.get('model_version'))
     except Exception as e:
-        st.warning(f"Could not fetch metadata: {str(e)}")
+        st.warning(f"Could not fetch metadata: {_describe_error(e)}")
         return None
 
-def make_prediction(input_data):
+@st.cache_data(ttl=24 * 60 * 60, show_spinner=False)
+def _post_prediction(input_data, model_version):
+    """
+    POST /predict, memoized for a day per input and served model version (a
+    redeployed model gets fresh predictions); raises on failure so errors are not cached
+    """
+    return _post_json(get_session(), PREDICT_URL, input_data)
+
+def make_prediction(input_data, model_version=None):
     try:
-        # UPDATED: Increased timeout for production
-        response = requests.post(
-            f"{API_BASE_URL}/predict", 
-            json=input_data, 
-            timeout=30,  # Increased timeout for Render
-            headers={'Content-Type': 'application/json'}
-        )
-        
-        if response.status_code == 200:
-            return response.json()
-        else:
-            error_detail = response.text
-            st.error(f"Prediction failed with status {response.status_code}: {error_detail}")
-            return None
+        return _post_prediction(input_data, model_version)
+    except requests.exceptions.HTTPError as e:
+        st.error(f"Prediction failed with status {e.response.status_code}: {e.response.text}")
+        return None
     except requests.exceptions.Timeout:
         st.error("""
         ⏰ Prediction request timed out. 
@@ -158,77 +202,47 @@ def make_prediction(input_data):
         st.error(f"Prediction failed: {str(e)}")
         return None
 
+@st.cache_data(ttl=24 * 60 * 60, show_spinner=False)
+def _predict_scenarios(model_version):
+    """
+    Predicted strength per SCENARIOS entry from one /predict/batch call, memoized
+    per served model version; raises on failure so errors are not cached
+    """
+    session = get_session()
+    payload = [dict(zip(FEATURE_KEYS, (data[key] for key in SESSION_KEYS))) for data in SCENARIOS.values()]
+    try:
+        results = _post_json(session, PREDICT_BATCH_URL, payload)
+    except requests.exceptions.HTTPError as e:
+        if e.response.status_code not in (404, 405):
+            raise
+        # API predates /predict/batch: concurrent single predictions, so the
+        # wait is one round-trip rather than one per scenario
+        results = asyncio.run(_post_each(session, PREDICT_URL, payload))
+    return {name: result['predicted_strength'] for name, result in zip(SCENARIOS, results)}
+
+def get_scenario_predictions(model_version):
+    """Scenario predictions for the quick-test buttons; empty (with a note) if the API can't provide them"""
+    try:
+        return _predict_scenarios(model_version)
+    except (requests.exceptions.RequestException, KeyError) as e:
+        st.caption(f"Scenario predictions unavailable: {_describe_error(e)}")
+        return {}
+
 def create_input_data_from_session():
     """Create input data dictionary from session state"""
-    return {
-        "Cement (component 1)(kg in a m^3 mixture)": st.session_state.cement,
-        "Blast Furnace Slag (component 2)(kg in a m^3 mixture)": st.session_state.blast_slag,
-        "Fly Ash (component 3)(kg in a m^3 mixture)": st.session_state.fly_ash,
-        "Water  (component 4)(kg in a m^3 mixture)": st.session_state.water,
-        "Superplasticizer (component 5)(kg in a m^3 mixture)": st.session_state.superplasticizer,
-        "Coarse Aggregate  (component 6)(kg in a m^3 mixture)": st.session_state.coarse_agg,
-        "Fine Aggregate (component 7)(kg in a m^3 mixture)": st.session_state.fine_agg,
-        "Age (day)": st.session_state.age
-    }
+    return dict(zip(FEATURE_KEYS, (st.session_state[key] for key in SESSION_KEYS)))
 
 def load_scenario(scenario_data):
     """Load a test scenario into session state"""
-    for key, value in scenario_data.items():
-        if key in st.session_state:
-            st.session_state[key] = value
+    st.session_state.update({k: v for k, v in scenario_data.items() if k in SCENARIO_KEYS})
 
-def main():
-    # Initialize session state
-    initialize_session_state()
-    
-    # Header
-    st.title("🏗️ Cement Strength Predictor")
-    st.markdown("Predict concrete compressive strength using machine learning")
-    
-    # Check API health with better loading state
-    with st.spinner("🔍 Checking API connection..."):
-        api_healthy, health_data = check_api_health()
-    
-    if not api_healthy:
-        st.error("""
-        ## 🚨 FastAPI Server Not Reachable!
-        
-        **If running locally:**
-        ```bash
-        uvicorn app.main:app --reload --port 8000
-        ```
-        
-        **If deployed on Render:**
-        - Check that both services are deployed
-        - Verify API service is running
-        - Wait 1-2 minutes for services to start
-        - Check Render dashboard for deployment status
-        
-        **Current API URL:** `{}`
-        """.format(API_BASE_URL))
-        
-        # Show current configuration
-        with st.expander("🔧 Debug Information"):
-            st.write(f"**API Base URL:** {API_BASE_URL}")
-            st.write(f"**Environment:** {'Production' if API_BASE_URL != 'http://localhost:8000' else 'Local'}")
-            st.write("**Troubleshooting Steps:**")
-            st.write("1. Check if API service is running")
-            st.write("2. Verify network connectivity")
-            st.write("3. Check API service logs")
-            st.write("4. Ensure CORS is properly configured")
-        
-        return
-    
-    # Show connection status
-    if api_healthy:
-        model_version = health_data.get('model_version', 'Unknown')
-        st.success(f"✅ API Connected - Model Version: {model_version}")
-        
-        # Show deployment info
-        if API_BASE_URL != "http://localhost:8000":
-            st.info(f"🌐 **Production Deployment** - Connected to: {API_BASE_URL}")
-    
-    # Main layout
+# st.fragment (Streamlit >= 1.37), experimental_fragment on older releases, or
+# a plain call (whole-app reruns) where neither exists
+_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda func: func)
+
+@_fragment
+def _prediction_pane(model_version):
+    """Input form and results; submitting reruns only this fragment, not the whole app"""
     col1, col2 = st.columns([2, 1])
     
     with col1:
@@ -236,94 +250,37 @@ def main():
         
         # Input form with clear organization
         with st.form("prediction_form"):
-            st.subheader("Binder Materials")
-            cement = st.number_input(
-                "Cement (kg/m³)", 
-                min_value=100.0, 
-                max_value=600.0, 
-                value=st.session_state.cement,
-                key="cement_input"
-            )
-            blast_slag = st.number_input(
-                "Blast Furnace Slag (kg/m³)", 
-                min_value=0.0, 
-                max_value=400.0, 
-                value=st.session_state.blast_slag,
-                key="blast_slag_input"
-            )
-            fly_ash = st.number_input(
-                "Fly Ash (kg/m³)", 
-                min_value=0.0, 
-                max_value=200.0, 
-                value=st.session_state.fly_ash,
-                key="fly_ash_input"
-            )
-            
-            st.subheader("Water & Additives")
-            water = st.number_input(
-                "Water (kg/m³)", 
-                min_value=120.0, 
-                max_value=250.0, 
-                value=st.session_state.water,
-                key="water_input"
-            )
-            superplasticizer = st.number_input(
-                "Superplasticizer (kg/m³)", 
-                min_value=0.0, 
-                max_value=40.0, 
-                value=st.session_state.superplasticizer,
-                step=0.1,
-                key="superplasticizer_input"
-            )
-            
-            st.subheader("Aggregates & Age")
-            coarse_agg = st.number_input(
-                "Coarse Aggregate (kg/m³)", 
-                min_value=800.0, 
-                max_value=1300.0, 
-                value=st.session_state.coarse_agg,
-                key="coarse_agg_input"
-            )
-            fine_agg = st.number_input(
-                "Fine Aggregate (kg/m³)", 
-                min_value=600.0, 
-                max_value=1000.0, 
-                value=st.session_state.fine_agg,
-                key="fine_agg_input"
-            )
-            age = st.number_input(
-                "Age (days)", 
-                min_value=1, 
-                max_value=365, 
-                value=st.session_state.age,
-                key="age_input"
-            )
+            values = {}
+            for section, specs in INPUT_SECTIONS:
+                st.subheader(section)
+                for label, min_value, max_value, key, step in specs:
+                    values[key] = st.number_input(
+                        label, 
+                        min_value=min_value, 
+                        max_value=max_value, 
+                        value=st.session_state[key],
+                        step=step,
+                        key=f"{key}_input"
+                    )
             
             submitted = st.form_submit_button("Predict Compressive Strength", type="primary")
             
             # Update session state when form is submitted
             if submitted:
-                st.session_state.cement = cement
-                st.session_state.blast_slag = blast_slag
-                st.session_state.fly_ash = fly_ash
-                st.session_state.water = water
-                st.session_state.superplasticizer = superplasticizer
-                st.session_state.coarse_agg = coarse_agg
-                st.session_state.fine_agg = fine_agg
-                st.session_state.age = age
+                st.session_state.update(values)
     
     with col2:
         st.header("Prediction Results")
         
         if submitted:
-            # Input validation
-            st.subheader("🔍 Input Validation")
-            is_valid = validate_inputs(cement, water, age)
+            # Everything below is computed first and drawn into this placeholder in
+            # one pass, so the spinner is the only intermediate frame
+            results = st.empty()
             
             with st.spinner("🤖 Making prediction... (This may take 30 seconds on first request)"):
                 input_data = create_input_data_from_session()
                 
-                prediction_result = make_prediction(input_data)
+                prediction_result = make_prediction(input_data, model_version)
                 
                 if prediction_result:
                     strength = prediction_result.get('predicted_strength', 0)
@@ -332,9 +289,22 @@ def main():
                     st.session_state.last_prediction = {
                         'strength': strength,
                         'inputs': input_data,
-                        'timestamp': pd.Timestamp.now()
+                        # Epoch nanoseconds; only ordered/compared, never displayed
+                        'timestamp': time.time_ns()
                     }
                     
+                    render, name, grade, description = _STRENGTH_CLASSES[classify_strengths(strength)]
+                    ratios = calculate_mix_ratios(
+                        values['cement'], values['water'], values['blast_slag'],
+                        values['fly_ash'], values['coarse_agg'], values['fine_agg']
+                    )
+            
+            with results.container():
+                # Input validation
+                st.subheader("🔍 Input Validation")
+                validate_inputs(values['cement'], values['water'], values['age'])
+                
+                if prediction_result:
                     # Display result
                     st.subheader("📊 Strength Prediction")
                     st.metric(
@@ -344,178 +314,156 @@ def main():
                     
                     # Strength classification
                     st.subheader("🏷️ Classification")
-                    if strength < 20:
-                        st.error("**Very Low Strength Concrete** (C12/15)")
-                        st.info("Suitable for non-structural applications")
-                    elif strength < 25:
-                        st.warning("**Low Strength Concrete** (C16/20)")
-                        st.info("Suitable for foundations and mass concrete")
-                    elif strength < 30:
-                        st.info("**Moderate Strength Concrete** (C25/30)")
-                        st.info("General purpose construction")
-                    elif strength < 40:
-                        st.success("**Standard Strength Concrete** (C30/37)")
-                        st.info("Reinforced concrete structures")
-                    elif strength < 50:
-                        st.success("**High Strength Concrete** (C40/50)")
-                        st.info("Pre-stressed concrete, high-rise buildings")
-                    elif strength < 60:
-                        st.success("**Very High Strength Concrete** (C50/60)")
-                        st.info("Special structures, bridges")
-                    else:
-                        st.success("**Ultra High Strength Concrete** (C60/75+)")
-                        st.info("Special applications, high-performance structures")
+                    render(f"**{name}** ({grade})")
+                    st.info(description)
                     
                     # Mix ratio calculations
                     st.subheader("📐 Mix Design Ratios")
-                    ratios = calculate_mix_ratios(cement, water, blast_slag, fly_ash, coarse_agg, fine_agg)
-                    
-                    col_ratio1, col_ratio2, col_ratio3 = st.columns(3)
-                    
-                    with col_ratio1:
-                        wc_ratio = ratios['water_cement_ratio']
-                        st.metric(
-                            "Water-Cement Ratio", 
-                            f"{wc_ratio:.2f}",
-                            help="Lower ratios typically yield higher strength"
-                        )
-                        
-                    with col_ratio2:
-                        total_agg = ratios['total_aggregate']
-                        st.metric(
-                            "Total Aggregate", 
-                            f"{total_agg:.0f} kg/m³",
-                            help="Combined coarse and fine aggregate content"
-                        )
-                        
-                    with col_ratio3:
-                        binder_content = ratios['total_binder']
-                        st.metric(
-                            "Total Binder", 
-                            f"{binder_content:.0f} kg/m³",
-                            help="Cement + Slag + Fly Ash"
-                        )
-                    
-                    # Additional ratios
-                    col_ratio4, col_ratio5 = st.columns(2)
                     
-                    with col_ratio4:
-                        agg_binder_ratio = ratios['aggregate_binder_ratio']
-                        st.metric(
-                            "Aggregate-Binder Ratio",
-                            f"{agg_binder_ratio:.1f}",
-                            help="Total aggregate / total binder"
-                        )
-                    
-                    with col_ratio5:
-                        fine_agg_ratio = ratios['fine_agg_ratio']
-                        st.metric(
-                            "Fine Aggregate Ratio",
-                            f"{fine_agg_ratio:.2f}",
-                            help="Fine aggregate / total aggregate"
-                        )
+                    # One table (a single Arrow payload) instead of a widget per ratio
+                    st.dataframe(
+                        {
+                            "Ratio": RATIO_LABELS,
+                            "Value": [
+                                fmt.format(getattr(ratios, field))
+                                for field, fmt in zip(RATIO_FIELDS, RATIO_FORMATS)
+                            ],
+                            "Notes": RATIO_NOTES
+                        },
+                        hide_index=True,
+                        use_container_width=True
+                    )
+
+def _show_json(data):
+    """Indented JSON in a code block, encoded by orjson; values it can't encode are shown via str()"""
+    st.code(orjson.dumps(data, default=str, option=orjson.OPT_INDENT_2).decode(), language="json")
+
+@_fragment
+def _sidebar_panel(health_data):
+    """Model, deployment and debug information; toggling its checkboxes reruns only this fragment"""
+    st.header("🏭 Model Information")
+    metadata = get_metadata(health_data)
+    if metadata:
+        st.write(f"**Model Type:** {metadata.get('model_type', 'XGBRegressor')}")
+        st.write(f"**Version:** {metadata.get('model_version', '1.0.0')}")
+        st.write(f"**Features:** {metadata.get('features_used', 8)}")
+        
+        if 'performance_metrics' in metadata:
+            st.subheader("📈 Performance Metrics")
+            metrics = metadata['performance_metrics']
+            col_metric1, col_metric2 = st.columns(2)
+            with col_metric1:
+                st.metric("R² Score", f"{metrics.get('r2_score', 0.89):.3f}")
+            with col_metric2:
+                st.metric("RMSE", f"{metrics.get('rmse', 4.23):.2f} MPa")
+    
+    # Deployment information
+    st.header("🌐 Deployment Info")
+    st.write(f"**API URL:** {API_BASE_URL}")
+    st.write(f"**Environment:** {'Production' if API_BASE_URL != 'http://localhost:8000' else 'Local'}")
+    
+    # Professional guidance
+    st.header("💡 Professional Guidance")
+    with st.expander("Water-Cement Ratio"):
+        st.write("""
+        **Recommended ranges:**
+        - **0.35-0.40**: High strength concrete
+        - **0.40-0.50**: Standard concrete
+        - **0.50-0.60**: Mass concrete
+        - **>0.60**: Low strength applications
+        """)
+    
+    with st.expander("Strength Classes"):
+        st.write("""
+        **Concrete strength classes (MPa):**
+        - **C12/15**: 12-15 MPa (Non-structural)
+        - **C25/30**: 25-30 MPa (General purpose)
+        - **C30/37**: 30-37 MPa (Reinforced structures)
+        - **C40/50**: 40-50 MPa (High-rise buildings)
+        - **C50/60+**: 50+ MPa (Special structures)
+        """)
+    
+    # Debug section
+    st.header("🔧 Debug Information")
+    if st.checkbox("Show Session State"):
+        _show_json(st.session_state.to_dict())
+    
+    if st.checkbox("Show Input Data"):
+        input_data = create_input_data_from_session()
+        _show_json(input_data)
+    
+    if st.checkbox("Show API Configuration"):
+        st.write(f"**API Base URL:** {API_BASE_URL}")
+        st.write(f"**Environment Variable API_URL:** {os.getenv('API_URL', 'Not set')}")
+
+def main():
+    # Initialize session state
+    initialize_session_state()
+    
+    # Header
+    st.title("🏗️ Cement Strength Predictor")
+    st.markdown("Predict concrete compressive strength using machine learning")
+    
+    # Health and metadata are cached; this forces a fresh check
+    if st.button("🔄 Refresh API Status"):
+        _fetch_health.clear()
+        _fetch_metadata.clear()
+    
+    # Check API health with better loading state
+    with st.spinner("🔍 Checking API connection..."):
+        api_healthy, health_data = check_api_health()
+    
+    if not api_healthy:
+        st.error(API_DOWN_MARKDOWN)
+        
+        # Show current configuration
+        with st.expander("🔧 Debug Information"):
+            st.write(f"**API Base URL:** {API_BASE_URL}")
+            st.write(f"**Environment:** {'Production' if API_BASE_URL != 'http://localhost:8000' else 'Local'}")
+            st.write("**Troubleshooting Steps:**")
+            st.write("1. Check if API service is running")
+            st.write("2. Verify network connectivity")
+            st.write("3. Check API service logs")
+            st.write("4. Ensure CORS is properly configured")
+        
+        return
+    
+    # Show connection status
+    model_version = health_data.get('model_version', 'Unknown')
+    st.success(f"✅ API Connected - Model Version: {model_version}")
+    
+    # Show deployment info
+    if API_BASE_URL != "http://localhost:8000":
+        st.info(f"🌐 **Production Deployment** - Connected to: {API_BASE_URL}")
+    
+    # Main layout: form and results rerun on their own
+    _prediction_pane(model_version)
     
     # Test scenarios
     st.markdown("---")
     st.header("🚀 Quick Test Scenarios")
     
-    scenarios = {
-        "High-Strength": {
-            "cement": 450.0, 
-            "blast_slag": 100.0, 
-            "fly_ash": 50.0, 
-            "water": 150.0,
-            "superplasticizer": 3.0, 
-            "coarse_agg": 1000.0, 
-            "fine_agg": 700.0, 
-            "age": 28
-        },
-        "Standard": {
-            "cement": 300.0, 
-            "blast_slag": 50.0, 
-            "fly_ash": 30.0, 
-            "water": 180.0,
-            "superplasticizer": 1.0, 
-            "coarse_agg": 1100.0, 
-            "fine_agg": 750.0, 
-            "age": 28
-        },
-        "Early Strength": {
-            "cement": 400.0, 
-            "blast_slag": 0.0, 
-            "fly_ash": 0.0, 
-            "water": 170.0,
-            "superplasticizer": 2.0, 
-            "coarse_agg": 1050.0, 
-            "fine_agg": 680.0, 
-            "age": 7
-        }
-    }
+    scenario_predictions = get_scenario_predictions(model_version)
+    
+    # Strength grade of every scenario prediction in one call
+    scenario_grades = dict(zip(
+        scenario_predictions,
+        (_STRENGTH_CLASSES[i][2] for i in classify_strengths(list(scenario_predictions.values())))
+    ))
     
     cols = st.columns(3)
-    for idx, (name, data) in enumerate(scenarios.items()):
+    for idx, (name, data) in enumerate(SCENARIOS.items()):
         with cols[idx]:
             if st.button(f"Load {name} Scenario", use_container_width=True, key=f"scenario_{idx}"):
                 load_scenario(data)
                 st.success(f"{name} scenario loaded!")
                 st.rerun()
+            if name in scenario_predictions:
+                st.caption(f"Predicted: {scenario_predictions[name]:.1f} MPa ({scenario_grades[name]})")
 
-    # Sidebar with enhanced information
+    # Sidebar with enhanced information; its widgets rerun only the sidebar
     with st.sidebar:
-        st.header("🏭 Model Information")
-        metadata = get_metadata()
-        if metadata:
-            st.write(f"**Model Type:** {metadata.get('model_type', 'XGBRegressor')}")
-            st.write(f"**Version:** {metadata.get('model_version', '1.0.0')}")
-            st.write(f"**Features:** {metadata.get('features_used', 8)}")
-            
-            if 'performance_metrics' in metadata:
-                st.subheader("📈 Performance Metrics")
-                metrics = metadata['performance_metrics']
-                col_metric1, col_metric2 = st.columns(2)
-                with col_metric1:
-                    st.metric("R² Score", f"{metrics.get('r2_score', 0.89):.3f}")
-                with col_metric2:
-                    st.metric("RMSE", f"{metrics.get('rmse', 4.23):.2f} MPa")
-        
-        # Deployment information
-        st.header("🌐 Deployment Info")
-        st.write(f"**API URL:** {API_BASE_URL}")
-        st.write(f"**Environment:** {'Production' if API_BASE_URL != 'http://localhost:8000' else 'Local'}")
-        
-        # Professional guidance
-        st.header("💡 Professional Guidance")
-        with st.expander("Water-Cement Ratio"):
-            st.write("""
-            **Recommended ranges:**
-            - **0.35-0.40**: High strength concrete
-            - **0.40-0.50**: Standard concrete
-            - **0.50-0.60**: Mass concrete
-            - **>0.60**: Low strength applications
-            """)
-        
-        with st.expander("Strength Classes"):
-            st.write("""
-            **Concrete strength classes (MPa):**
-            - **C12/15**: 12-15 MPa (Non-structural)
-            - **C25/30**: 25-30 MPa (General purpose)
-            - **C30/37**: 30-37 MPa (Reinforced structures)
-            - **C40/50**: 40-50 MPa (High-rise buildings)
-            - **C50/60+**: 50+ MPa (Special structures)
-            """)
-        
-        # Debug section
-        st.header("🔧 Debug Information")
-        if st.checkbox("Show Session State"):
-            st.write(st.session_state)
-        
-        if st.checkbox("Show Input Data"):
-            input_data = create_input_data_from_session()
-            st.json(input_data)
-        
-        if st.checkbox("Show API Configuration"):
-            st.write(f"**API Base URL:** {API_BASE_URL}")
-            st.write(f"**Environment Variable API_URL:** {os.getenv('API_URL', 'Not set')}")
+        _sidebar_panel(health_data)
 
 if __name__ == "__main__":
     main()
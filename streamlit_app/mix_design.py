@@ -0,0 +1,185 @@
+"""
+Pure mix-design helpers and constant tables for the Streamlit app.
+
+Kept out of app.py because Streamlit re-executes the main script on every
+rerun, which would rebuild these lru_caches and tables each time; an imported
+module is loaded once per process.
+"""
+from collections import namedtuple
+from functools import lru_cache
+from types import MappingProxyType
+
+import numpy as np
+
+# Column order of the mix arrays passed to mix_ratio_table()
+MIX_COLUMNS = ('cement', 'water', 'blast_slag', 'fly_ash', 'coarse_agg', 'fine_agg')
+
+MixRatios = namedtuple(
+    'MixRatios',
+    ['water_cement_ratio', 'total_binder', 'total_aggregate', 'aggregate_binder_ratio', 'fine_agg_ratio']
+)
+
+# API field names, in the same order as SESSION_KEYS (the app's session state names)
+FEATURE_KEYS = (
+    "Cement (component 1)(kg in a m^3 mixture)",
+    "Blast Furnace Slag (component 2)(kg in a m^3 mixture)",
+    "Fly Ash (component 3)(kg in a m^3 mixture)",
+    "Water  (component 4)(kg in a m^3 mixture)",
+    "Superplasticizer (component 5)(kg in a m^3 mixture)",
+    "Coarse Aggregate  (component 6)(kg in a m^3 mixture)",
+    "Fine Aggregate (component 7)(kg in a m^3 mixture)",
+    "Age (day)"
+)
+SESSION_KEYS = ('cement', 'blast_slag', 'fly_ash', 'water', 'superplasticizer', 'coarse_agg', 'fine_agg', 'age')
+
+# Session state keys a scenario may set (the mix inputs)
+SCENARIO_KEYS = frozenset(SESSION_KEYS)
+
+# App form inputs by section: (label, min, max, session key, step); step None keeps
+# Streamlit's default (0.01 for floats, 1 for ints)
+INPUT_SECTIONS = (
+    ("Binder Materials", (
+        ("Cement (kg/m³)", 100.0, 600.0, "cement", None),
+        ("Blast Furnace Slag (kg/m³)", 0.0, 400.0, "blast_slag", None),
+        ("Fly Ash (kg/m³)", 0.0, 200.0, "fly_ash", None),
+    )),
+    ("Water & Additives", (
+        ("Water (kg/m³)", 120.0, 250.0, "water", None),
+        ("Superplasticizer (kg/m³)", 0.0, 40.0, "superplasticizer", 0.1),
+    )),
+    ("Aggregates & Age", (
+        ("Coarse Aggregate (kg/m³)", 800.0, 1300.0, "coarse_agg", None),
+        ("Fine Aggregate (kg/m³)", 600.0, 1000.0, "fine_agg", None),
+        ("Age (days)", 1, 365, "age", None),
+    )),
+)
+
+# Initial session state for the app. initialize_session_state() stores these
+# values by reference in every session, so they are immutable (mutable defaults
+# are created per session there)
+DEFAULTS = MappingProxyType({
+    'cement': 300.0,
+    'blast_slag': 0.0,
+    'fly_ash': 0.0,
+    'water': 180.0,
+    'superplasticizer': 2.5,
+    'coarse_agg': 1050.0,
+    'fine_agg': 750.0,
+    'age': 28,
+    'last_prediction': None
+})
+
+# Quick test scenarios for the app, keyed by its session state names; read-only
+# since every session shares them
+SCENARIOS = MappingProxyType({
+    "High-Strength": MappingProxyType({
+        "cement": 450.0, 
+        "blast_slag": 100.0, 
+        "fly_ash": 50.0, 
+        "water": 150.0,
+        "superplasticizer": 3.0, 
+        "coarse_agg": 1000.0, 
+        "fine_agg": 700.0, 
+        "age": 28
+    }),
+    "Standard": MappingProxyType({
+        "cement": 300.0, 
+        "blast_slag": 50.0, 
+        "fly_ash": 30.0, 
+        "water": 180.0,
+        "superplasticizer": 1.0, 
+        "coarse_agg": 1100.0, 
+        "fine_agg": 750.0, 
+        "age": 28
+    }),
+    "Early Strength": MappingProxyType({
+        "cement": 400.0, 
+        "blast_slag": 0.0, 
+        "fly_ash": 0.0, 
+        "water": 170.0,
+        "superplasticizer": 2.0, 
+        "coarse_agg": 1050.0, 
+        "fine_agg": 680.0, 
+        "age": 7
+    })
+})
+
+# Rows of the mix design ratio table, in display order:
+# (label, MixRatios field, value format, note)
+RATIO_ROWS = (
+    ("Water-Cement Ratio", "water_cement_ratio", "{:.2f}", "Lower ratios typically yield higher strength"),
+    ("Total Aggregate", "total_aggregate", "{:.0f} kg/m³", "Combined coarse and fine aggregate content"),
+    ("Total Binder", "total_binder", "{:.0f} kg/m³", "Cement + Slag + Fly Ash"),
+    ("Aggregate-Binder Ratio", "aggregate_binder_ratio", "{:.1f}", "Total aggregate / total binder"),
+    ("Fine Aggregate Ratio", "fine_agg_ratio", "{:.2f}", "Fine aggregate / total aggregate")
+)
+RATIO_LABELS, RATIO_FIELDS, RATIO_FORMATS, RATIO_NOTES = zip(*RATIO_ROWS)
+
+# Upper bounds (MPa) of the strength classes, in ascending order; the app's
+# _STRENGTH_CLASSES has one more row for everything above the last one
+STRENGTH_THRESHOLDS = np.array([20, 25, 30, 40, 50, 60])
+
+def classify_strengths(strengths):
+    """Strength class index (0 to len(STRENGTH_THRESHOLDS)) for each strength, in one vectorized search"""
+    # side="right": a strength equal to a threshold belongs to the class above it
+    return np.searchsorted(STRENGTH_THRESHOLDS, strengths, side="right")
+
+@lru_cache(maxsize=128)
+def compute_validation(cement, water, age):
+    """Professional guidance for a mix: (warnings, info, ok)"""
+    warnings = []
+    info = []
+    
+    # Water-cement ratio validation
+    water_cement_ratio = water / cement if cement > 0 else 0
+    if water_cement_ratio > 0.7:
+        warnings.append("⚠️ High water-cement ratio may significantly reduce strength and durability")
+    elif water_cement_ratio > 0.6:
+        warnings.append("⚠️ Moderate water-cement ratio - consider reducing for higher strength")
+    elif water_cement_ratio < 0.3:
+        warnings.append("⚠️ Very low water-cement ratio may affect workability")
+    else:
+        info.append("✅ Optimal water-cement ratio range")
+    
+    # Age validation
+    if age < 3:
+        info.append("💡 Very early age testing - strength will develop significantly over time")
+    elif age < 7:
+        info.append("💡 Early age concrete typically reaches ~65% of 28-day strength")
+    elif age < 28:
+        info.append("💡 Concrete typically reaches ~90% of 28-day strength at 14 days")
+    
+    # Cement content validation
+    if cement < 250:
+        warnings.append("⚠️ Low cement content may result in lower strength and durability")
+    elif cement > 500:
+        info.append("💡 High cement content - consider supplementary cementitious materials")
+    
+    return tuple(warnings), tuple(info), len(warnings) == 0
+
+def mix_ratio_table(mixes):
+    """
+    Vectorized mix ratios: an (N, 6) array of mixes in MIX_COLUMNS order gives an
+    (N, 5) array in MixRatios field order, e.g. for replaying prediction history
+    """
+    mixes = np.asarray(mixes, dtype=np.float64).reshape(-1, len(MIX_COLUMNS))
+    cement, water, fine_agg = mixes[:, 0], mixes[:, 1], mixes[:, 5]
+    total_binder = mixes[:, [0, 2, 3]].sum(axis=1)
+    total_aggregate = mixes[:, [4, 5]].sum(axis=1)
+    
+    # Undefined ratios (zero denominator) stay 0
+    ratios = np.zeros((len(mixes), len(MixRatios._fields)))
+    np.divide(water, cement, out=ratios[:, 0], where=cement > 0)
+    ratios[:, 1] = total_binder
+    ratios[:, 2] = total_aggregate
+    np.divide(total_aggregate, total_binder, out=ratios[:, 3], where=total_binder > 0)
+    np.divide(fine_agg, total_aggregate, out=ratios[:, 4], where=total_aggregate > 0)
+    return ratios
+
+# Keyed on the exact inputs: they step by 0.01 kg/m³, and rounding keys to
+# anything coarser changes displayed ratios (e.g. a 301.46 binder shown as 302)
+@lru_cache(maxsize=256)
+def calculate_mix_ratios(cement, water, blast_slag, fly_ash, coarse_agg, fine_agg):
+    """Calculate and return key mix design ratios"""
+    ratios = mix_ratio_table((cement, water, blast_slag, fly_ash, coarse_agg, fine_agg))
+    return MixRatios(*ratios[0].tolist())
@@ -0,0 +1,33 @@
+import numpy as np
+from scipy.stats import ks_2samp
+
+from monitoring.drift_detector import DataDriftDetector
+
+def test_p_values_match_asymptotic_ks_2samp():
+    rng = np.random.default_rng(0)
+    training = {
+        "cement": rng.normal(280.0, 100.0, 500),
+        "age": rng.choice([3, 7, 28, 56, 90], 500),  # heavily tied values
+        "water": rng.normal(180.0, 20.0, 50)
+    }
+    current = {
+        "cement": rng.normal(300.0, 100.0, 200),
+        "age": rng.choice([7, 28, 28, 90, 180], 120),
+        "water": rng.normal(185.0, 20.0, 7)
+    }
+    
+    p_values = DataDriftDetector(training).detect_drift(current)
+    
+    assert list(p_values) == list(training)
+    for feature, p_value in p_values.items():
+        expected = ks_2samp(training[feature], current[feature], method="asymp").pvalue
+        assert np.isclose(p_value, expected, rtol=1e-12, atol=0)
+
+def test_training_data_is_copied_and_sorted_once():
+    training = {"cement": [540.0, 102.0, 332.5]}
+    
+    detector = DataDriftDetector(training)
+    training["cement"].append(1000.0)
+    
+    assert detector._sorted_train["cement"].tolist() == [102.0, 332.5, 540.0]
+    assert detector.detect_drift({"cement": [102.0, 332.5, 540.0]})["cement"] == 1.0
@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+
+from streamlit_app.mix_design import calculate_mix_ratios, classify_strengths, mix_ratio_table
+
+def test_mix_ratios_use_exact_inputs():
+    ratios = calculate_mix_ratios(201.23, 160.5, 50.12, 50.11, 1000.0, 800.0)
+
+    # A 301.46 binder must not be rounded to 302 on the way through the cache
+    assert ratios.total_binder == pytest.approx(301.46)
+    assert ratios.water_cement_ratio == pytest.approx(160.5 / 201.23)
+    assert ratios.aggregate_binder_ratio == pytest.approx(1800.0 / 301.46)
+
+def test_mix_ratio_table_zero_denominators():
+    # No cement, binder or aggregate: the ratios read 0 instead of inf/nan
+    result = mix_ratio_table(np.zeros((1, 6)))
+
+    assert (result == 0).all()
+
+@pytest.mark.parametrize("strength,expected", [
+    (19.99, 0),
+    (20.0, 1),
+    (25.0, 2),
+    (59.99, 5),
+    (60.0, 6),
+])
+def test_classify_strengths_boundaries(strength, expected):
+    assert classify_strengths(np.array([strength]))[0] == expected
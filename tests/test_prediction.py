@@ -0,0 +1,130 @@
+import asyncio
+import time
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import MAX_BATCH_SIZE, app
+from src.model_loader import ModelLoader
+from src.predict import predictor
+from src.schemas import PredictionInput
+
+def make_input(cement, water, age):
+    return PredictionInput(
+        cement=cement,
+        blast_furnace_slag=0.0,
+        fly_ash=0.0,
+        water=water,
+        superplasticizer=2.5,
+        coarse_aggregate=1040.0,
+        fine_aggregate=676.0,
+        age=age
+    )
+
+def test_schema_features_match_preprocessing():
+    inp = make_input(540.0, 162.0, 28)
+    
+    expected = predictor.preprocessor.preprocess(inp.model_dump(by_alias=True))
+    
+    assert (predictor._preprocess(inp) == expected).all()
+
+def test_batched_predictions_match_direct_predictions():
+    inputs = [make_input(540.0, 162.0, 28), make_input(300.0, 180.0, 7), make_input(400.0, 170.0, 90)]
+    expected = [predictor.predict(inp)["predicted_strength"] for inp in inputs]
+    predictor.clear_cache()
+    
+    async def run_concurrently():
+        predictor.start_batching()
+        try:
+            return await asyncio.gather(*(predictor.apredict(inp) for inp in inputs))
+        finally:
+            await predictor.stop_batching()
+    
+    results = asyncio.run(run_concurrently())
+    
+    assert [r["predicted_strength"] for r in results] == expected
+
+def test_single_request_is_not_delayed_by_batch_window(monkeypatch):
+    inp = make_input(420.0, 168.0, 56)
+    predictor.clear_cache()
+    monkeypatch.setattr(predictor, "batch_window", 1.0)
+    
+    async def run_alone():
+        predictor.start_batching()
+        try:
+            start = time.perf_counter()
+            result = await predictor.apredict(inp)
+            return result, time.perf_counter() - start
+        finally:
+            await predictor.stop_batching()
+    
+    result, elapsed = asyncio.run(run_alone())
+    
+    assert elapsed < 0.5
+    assert result["predicted_strength"] == predictor.predict(inp)["predicted_strength"]
+
+def test_repeated_input_is_served_from_cache():
+    inp = make_input(350.0, 175.0, 14)
+    predictor.clear_cache()
+    
+    first = predictor.predict(inp)
+    
+    assert predictor._get_cached(predictor._cache_key(inp)) == first["predicted_strength"]
+    assert predictor.predict(inp) == first
+
+def test_batch_predictions_match_single_predictions():
+    inputs = [make_input(540.0, 162.0, 28), make_input(300.0, 180.0, 7), make_input(400.0, 170.0, 90)]
+    predictor.clear_cache()
+    
+    expected = [predictor.predict(inp)["predicted_strength"] for inp in inputs]
+    predictor.clear_cache()
+    
+    assert [r["predicted_strength"] for r in predictor.predict_batch(inputs)] == expected
+
+def test_native_booster_matches_pickled_model(tmp_path):
+    model_path = str(tmp_path / "model.json")
+    predictor.model_loader.model.get_booster().save_model(model_path)
+    inputs = [make_input(540.0, 162.0, 28), make_input(300.0, 180.0, 7)]
+    features = np.vstack([predictor._preprocess(inp) for inp in inputs])
+    
+    loader = ModelLoader(model_path)
+    
+    assert (loader.predict(features) == predictor.model_loader.predict(features)).all()
+
+def test_numeric_string_water_is_parsed_before_ratio_check():
+    data = make_input(540.0, 162.0, 28).model_dump(by_alias=True)
+    data["Water  (component 4)(kg in a m^3 mixture)"] = "162"
+    
+    inp = PredictionInput(**data)
+    
+    assert inp.water == 162.0
+
+def test_batch_endpoint_returns_one_response_per_mix():
+    inputs = [make_input(540.0, 162.0, 28), make_input(300.0, 180.0, 7)]
+    payload = [inp.model_dump(by_alias=True, exclude={"total_binder", "water_binder_ratio", "aggregate_cement_ratio"}) for inp in inputs]
+    
+    with TestClient(app) as client:
+        response = client.post("/predict/batch", json=payload)
+    
+    assert response.status_code == 200
+    body = response.json()
+    assert [r["predicted_strength"] for r in body] == [predictor.predict(inp)["predicted_strength"] for inp in inputs]
+    assert set(body[0]) == {"predicted_strength", "units", "model_version", "features_used", "status"}
+
+@pytest.mark.parametrize("size", [0, MAX_BATCH_SIZE + 1])
+def test_batch_endpoint_rejects_out_of_range_sizes(size):
+    payload = [make_input(540.0, 162.0, 28).model_dump(by_alias=True)] * size
+    
+    with TestClient(app) as client:
+        assert client.post("/predict/batch", json=payload).status_code == 422
+
+def test_batch_endpoint_maps_value_error_to_400(monkeypatch):
+    def fail(inputs):
+        raise ValueError("cement must be > 0")
+    monkeypatch.setattr(predictor, "predict_batch", fail)
+    
+    with TestClient(app) as client:
+        response = client.post("/predict/batch", json=[make_input(540.0, 162.0, 28).model_dump(by_alias=True)])
+    
+    assert response.status_code == 400
+    assert response.json()["detail"] == "cement must be > 0"
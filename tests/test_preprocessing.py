@@ -1,34 +1,137 @@
-import sys
-import os
-import pandas as pd
-
-# Add project root to Python path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import numpy as np
+import pytest
 
+import src.preprocessing
 from src.preprocessing import CementDataPreprocessor
 
+# Raw dataset column names, as in the training notebook
+_COL_CEMENT = "Cement (component 1)(kg in a m^3 mixture)"
+_COL_SLAG = "Blast Furnace Slag (component 2)(kg in a m^3 mixture)"
+_COL_FLY_ASH = "Fly Ash (component 3)(kg in a m^3 mixture)"
+_COL_WATER = "Water  (component 4)(kg in a m^3 mixture)"
+_COL_SUPERPLASTICIZER = "Superplasticizer (component 5)(kg in a m^3 mixture)"
+_COL_COARSE_AGG = "Coarse Aggregate  (component 6)(kg in a m^3 mixture)"
+_COL_FINE_AGG = "Fine Aggregate (component 7)(kg in a m^3 mixture)"
+_COL_AGE = "Age (day)"
+
+# Test input matching notebook structure
+_NOTEBOOK_ROW = {
+    _COL_CEMENT: 540.0,
+    _COL_SLAG: 0.0,
+    _COL_FLY_ASH: 0.0,
+    _COL_WATER: 162.0,
+    _COL_SUPERPLASTICIZER: 2.5,
+    _COL_COARSE_AGG: 1040.0,
+    _COL_FINE_AGG: 676.0,
+    _COL_AGE: 28
+}
+
 def test_preprocessing():
     preprocessor = CementDataPreprocessor()
     
-    # Test input matching notebook structure
-    test_input = {
-        "Cement (component 1)(kg in a m^3 mixture)": 540.0,
-        "Blast Furnace Slag (component 2)(kg in a m^3 mixture)": 0.0,
-        "Fly Ash (component 3)(kg in a m^3 mixture)": 0.0,
-        "Water  (component 4)(kg in a m^3 mixture)": 162.0,
-        "Superplasticizer (component 5)(kg in a m^3 mixture)": 2.5,
-        "Coarse Aggregate  (component 6)(kg in a m^3 mixture)": 1040.0,
-        "Fine Aggregate (component 7)(kg in a m^3 mixture)": 676.0,
-        "Age (day)": 28
-    }
-    
-    result = preprocessor.preprocess(test_input)
+    result = preprocessor.preprocess_array(_NOTEBOOK_ROW)
     
     # Check that engineered features are created
-    assert 'total_binder' in result.columns
-    assert 'water_binder_ratio' in result.columns
-    assert 'aggregate_cement_ratio' in result.columns
+    assert result.shape == (1, len(preprocessor.feature_names))
+    assert result.dtype == np.float32
+    columns = preprocessor.feature_names
     
     # Check calculations match notebook logic
-    assert result['total_binder'].iloc[0] == 540.0  # cement + slag + fly_ash
-    assert result['water_binder_ratio'].iloc[0] == 162.0 / 540.0
\ No newline at end of file
+    assert result[0, columns.index('total_binder')] == 540.0  # cement + slag + fly_ash
+    assert result[0, columns.index('water_binder_ratio')] == np.float32(162.0 / 540.0)
+    assert result[0, columns.index('aggregate_cement_ratio')] == np.float32((1040.0 + 676.0) / 540.0)
+
+def test_preprocess_frame_labels_columns():
+    pd = pytest.importorskip("pandas")
+    preprocessor = CementDataPreprocessor()
+    
+    result = preprocessor.preprocess_frame(_NOTEBOOK_ROW)
+    
+    assert isinstance(result, pd.DataFrame)
+    assert list(result.columns) == preprocessor.feature_names
+    assert result['total_binder'].iloc[0] == 540.0
+    assert (result.to_numpy() == preprocessor.preprocess_array(_NOTEBOOK_ROW)).all()
+
+@pytest.mark.parametrize("cement,slag,fly_ash,water", [
+    (540.0, 0.0, 0.0, 162.0),
+    (300.0, 50.0, 30.0, 180.0),
+    (102.0, 153.0, 0.0, 192.0),
+    (475.0, 0.0, 59.0, 142.0),
+    (540.0, 359.4, 200.1, 247.0)
+])
+def test_engineered_features(cement, slag, fly_ash, water):
+    preprocessor = CementDataPreprocessor()
+    columns = preprocessor.feature_names
+    
+    result = preprocessor.preprocess_values([cement, slag, fly_ash, water, 2.5, 1040.0, 676.0, 28])
+    
+    assert result[0, columns.index('total_binder')] == np.float32(cement + slag + fly_ash)
+    assert result[0, columns.index('water_binder_ratio')] == np.float32(water / (cement + slag + fly_ash))
+    assert result[0, columns.index('aggregate_cement_ratio')] == np.float32((1040.0 + 676.0) / cement)
+
+def test_preprocess_batch_engineered_columns():
+    preprocessor = CementDataPreprocessor()
+    columns = preprocessor.feature_names
+    rows = np.random.default_rng(1).uniform(1.0, 1000.0, size=(1000, 8))
+    cement, slag, fly_ash, water = rows[:, 0], rows[:, 1], rows[:, 2], rows[:, 3]
+    
+    result = preprocessor.preprocess_batch(rows)
+    
+    # Whole columns at once; float32 storage limits agreement to ~1e-7 relative
+    assert np.allclose(result[:, columns.index('total_binder')], cement + slag + fly_ash, rtol=1e-6)
+    assert np.allclose(result[:, columns.index('water_binder_ratio')], water / (cement + slag + fly_ash), rtol=1e-6)
+    assert np.allclose(result[:, columns.index('aggregate_cement_ratio')], (rows[:, 5] + rows[:, 6]) / cement, rtol=1e-6)
+
+def test_preprocessing_rejects_zero_cement():
+    preprocessor = CementDataPreprocessor()
+    
+    # Would divide by zero in aggregate_cement_ratio
+    values = [0.0, 100.0, 50.0, 162.0, 2.5, 1040.0, 676.0, 28]
+    with pytest.raises(ValueError, match="cement must be > 0"):
+        preprocessor.preprocess_values(values)
+
+
+def test_preprocess_batch_matches_single_rows():
+    preprocessor = CementDataPreprocessor()
+    
+    rows = [
+        [540.0, 0.0, 0.0, 162.0, 2.5, 1040.0, 676.0, 28],
+        [332.5, 142.5, 0.0, 228.0, 0.0, 932.0, 594.0, 270],
+        [198.6, 132.4, 0.0, 192.0, 0.0, 978.4, 825.5, 90]
+    ]
+    
+    result = preprocessor.preprocess_batch(rows)
+    
+    assert result.shape == (3, len(preprocessor.feature_names))
+    assert result.dtype == np.float32
+    assert (result == np.vstack([preprocessor.preprocess_values(row) for row in rows])).all()
+
+
+def test_numba_kernel_matches_numpy_path(monkeypatch):
+    pytest.importorskip("numba")
+    preprocessor = CementDataPreprocessor()
+    rows = np.random.default_rng(2).uniform(1.0, 1000.0, size=(1000, 8))
+    assert src.preprocessing._engineer_features is not None
+    
+    with_kernel = preprocessor.preprocess_batch(rows)
+    monkeypatch.setattr(src.preprocessing, "_engineer_features", None)
+    
+    # Bit for bit, not just allclose
+    assert with_kernel.tobytes() == preprocessor.preprocess_batch(rows).tobytes()
+
+
+@pytest.mark.parametrize("use_numba", [True, False])
+@pytest.mark.parametrize("rows,message", [
+    # Row 0: cement <= 0 with a positive binder; row 1: zero binder
+    ([[-10.0, 20.0, 0.0, 162.0, 2.5, 1040.0, 676.0, 28], [0.0, 0.0, 0.0, 162.0, 2.5, 1040.0, 676.0, 28]], "cement must be > 0"),
+    ([[0.0, 0.0, 0.0, 162.0, 2.5, 1040.0, 676.0, 28], [-10.0, 20.0, 0.0, 162.0, 2.5, 1040.0, 676.0, 28]], "total_binder must be > 0")
+])
+def test_preprocess_batch_reports_first_bad_row(monkeypatch, use_numba, rows, message):
+    if use_numba:
+        pytest.importorskip("numba")
+    else:
+        monkeypatch.setattr(src.preprocessing, "_engineer_features", None)
+    preprocessor = CementDataPreprocessor()
+    
+    with pytest.raises(ValueError, match=message):
+        preprocessor.preprocess_batch([[540.0, 0.0, 0.0, 162.0, 2.5, 1040.0, 676.0, 28]] + rows)